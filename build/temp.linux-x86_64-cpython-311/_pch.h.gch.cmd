@@ -0,0 +1 @@
+gcc -Wsign-compare -DNDEBUG -g -fwrapv -O3 -Wall -fPIC -I/root/package/include -I/root/.pyenv/versions/3.11.7/lib/python3.11/site-packages/pybind11/include -I/root/.pyenv/versions/3.11.7/include/python3.11 -std=c++17 -fvisibility=hidden -g0 -fvisibility=hidden -fvisibility-inlines-hidden -flto=auto -ffat-lto-objects -ffunction-sections -fdata-sections -x c++-header /root/package/build/temp.linux-x86_64-cpython-311/_pch.h -o /root/package/build/temp.linux-x86_64-cpython-311/_pch.h.gch
\ No newline at end of file
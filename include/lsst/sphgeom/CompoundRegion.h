@@ -29,7 +29,9 @@
 
 #include <iosfwd>
 #include <iterator>
-#include <array>
+#include <memory>
+#include <mutex>
+#include <vector>
 
 #include "Region.h"
 #include "UnitVector3d.h"
@@ -49,17 +51,22 @@ public:
     //@{
     /// Construct by copying or taking ownership of operands.
     CompoundRegion(Region const &first, Region const &second);
-    explicit CompoundRegion(std::array<std::unique_ptr<Region>, 2> operands) noexcept;
+    explicit CompoundRegion(std::vector<std::unique_ptr<Region>> operands);
     //@}
 
+    // Copies and moves start with an empty encode() cache, as the cache
+    // guard can be neither copied nor moved.
     CompoundRegion(CompoundRegion const &);
-    CompoundRegion(CompoundRegion &&) noexcept = default;
+    CompoundRegion(CompoundRegion &&other) noexcept;
 
     // Disable assignment (including for subclasses) because it makes it hard
     // to guarantee memory safety for operand accessors in Python.
     CompoundRegion &operator=(CompoundRegion const &) = delete;
     CompoundRegion &operator=(CompoundRegion &&) = delete;
 
+    // Return the number of operands.
+    std::size_t nOperands() const { return _operands.size(); }
+
     // Return references to the operands.
     Region const & getOperand(std::size_t n) const {
         return *_operands[n];
@@ -83,26 +90,48 @@ public:
 
 protected:
 
-    // Implementation helper for encode().
+    // Implementation helper for the subclass constructors: replaces any
+    // operand of type R with the operands of that operand, so that nesting
+    // compound regions of the same type yields a single flat operand list.
+    template <typename R>
+    static std::vector<std::unique_ptr<Region>> _flatten(
+        std::vector<std::unique_ptr<Region>> operands);
+
+    // Return the operands in the order in which contains() tests them:
+    // roughly cheapest first, so that the cheap tests usually decide the
+    // result before the expensive ones are made.
+    std::vector<Region const *> const &_getContainsOrder() const { return _containsOrder; }
+
+    // Implementation helper for encode(). Compound regions are immutable,
+    // so the encoding is computed once and then returned from a cache.
     std::vector<std::uint8_t> _encode(std::uint8_t tc) const;
 
     // Implementation helper for decode().
-    static std::array<std::unique_ptr<Region>, 2> _decode(
+    static std::vector<std::unique_ptr<Region>> _decode(
         std::uint8_t tc, std::uint8_t const *buffer, std::size_t nBytes);
 
 private:
-    std::array<std::unique_ptr<Region>, 2> _operands;
+    std::vector<std::unique_ptr<Region>> _operands;
+    std::vector<Region const *> _containsOrder;
+    mutable std::vector<std::uint8_t> _encoded;
+    mutable std::once_flag _encodedOnce;
 };
 
 /// UnionRegion is a lazy point-set union of its operands.
 ///
 /// All operations on a UnionRegion are implementing by delegating to its
-/// nested operand regions and combining the results.
+/// nested operand regions and combining the results. Operands that are
+/// themselves UnionRegions are replaced by their own operands on
+/// construction. A UnionRegion with no operands is empty.
 class UnionRegion : public CompoundRegion {
 public:
     static constexpr uint8_t TYPE_CODE = 'u';
 
-    using CompoundRegion::CompoundRegion;
+    //@{
+    /// Construct by copying or taking ownership of operands.
+    UnionRegion(Region const &first, Region const &second);
+    explicit UnionRegion(std::vector<std::unique_ptr<Region>> operands);
+    //@}
 
     // Region interface.
     std::unique_ptr<Region> clone() const override { return std::make_unique<UnionRegion>(*this); }
@@ -130,12 +159,18 @@ public:
 /// IntersectionRegion is a lazy point-set inersection of its operands.
 ///
 /// All operations on a IntersectionRegion are implementing by delegating to
-/// its nested operand regions and combining the results.
+/// its nested operand regions and combining the results. Operands that are
+/// themselves IntersectionRegions are replaced by their own operands on
+/// construction. An IntersectionRegion with no operands is the full sphere.
 class IntersectionRegion : public CompoundRegion {
 public:
     static constexpr uint8_t TYPE_CODE = 'i';
 
-    using CompoundRegion::CompoundRegion;
+    //@{
+    /// Construct by copying or taking ownership of operands.
+    IntersectionRegion(Region const &first, Region const &second);
+    explicit IntersectionRegion(std::vector<std::unique_ptr<Region>> operands);
+    //@}
 
     // Region interface.
     std::unique_ptr<Region> clone() const override { return std::make_unique<IntersectionRegion>(*this); }
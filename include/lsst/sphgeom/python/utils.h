@@ -24,10 +24,12 @@
 #define LSST_SPHGEOM_PYTHON_UTILS_H_
 
 #include "pybind11/pybind11.h"
+#include "pybind11/numpy.h"
 
 #include <limits>
 #include <sstream>
 #include <stdexcept>
+#include <vector>
 
 #include "lsst/sphgeom/Region.h"
 
@@ -65,6 +67,30 @@ std::unique_ptr<R> decode(pybind11::bytes bytes) {
     return R::decode(buffer, n);
 }
 
+/// Test whether the vectors stored along the last axis of `xyz`, which must
+/// have length 3, are inside `self`. The vectors need not be normalized.
+/// The result has the shape of `xyz` with the last axis removed.
+inline pybind11::array_t<bool> containsArray(
+        Region const &self,
+        pybind11::array_t<double, pybind11::array::c_style | pybind11::array::forcecast> xyz) {
+    if (xyz.ndim() == 0 || xyz.shape(xyz.ndim() - 1) != 3) {
+        throw pybind11::value_error("The last axis of the array must have length 3");
+    }
+    pybind11::array_t<bool> result(std::vector<pybind11::ssize_t>(
+            xyz.shape(), xyz.shape() + xyz.ndim() - 1));
+    double const *in = xyz.data();
+    bool *out = result.mutable_data();
+    pybind11::ssize_t n = result.size();
+    {
+        // The loop does not touch any Python objects.
+        pybind11::gil_scoped_release release;
+        for (pybind11::ssize_t i = 0; i < n; ++i, in += 3) {
+            out[i] = self.contains(in[0], in[1], in[2]);
+        }
+    }
+    return result;
+}
+
 /// Create a vector of Region (or Region-subclass) pointers by copying the
 /// regions from a sized Python iterable (e.g. S == py::tuple).
 ///
@@ -76,6 +102,10 @@ inline std::vector<std::unique_ptr<Region>> convert_region_sequence(S const & se
     std::vector<std::unique_ptr<Region>> result;
     result.reserve(seq.size());
     for (pybind11::handle py_region : seq) {
+        if (!pybind11::isinstance<Region>(py_region)) {
+            throw pybind11::type_error(
+                    pybind11::str("Expected a Region, got {!r}").format(py_region));
+        }
         result.push_back(py_region.cast<Region const &>().clone());
     }
     return result;
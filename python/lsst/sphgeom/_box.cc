@@ -76,15 +76,17 @@ void defineClass(py::class_<Box, std::unique_ptr<Box>, Region> &cls) {
             py::is_operator());
     cls.def("__ne__", (bool (Box::*)(LonLat const &) const) & Box::operator!=,
             py::is_operator());
+    // Point overloads come first; they are the most frequently called, and
+    // rejecting an argument of the wrong class is expensive in pybind11.
+    // Rewrap this base class method since there are overloads in this subclass
+    cls.def("__contains__",
+            (bool (Box::*)(UnitVector3d const &) const) & Box::contains,
+            py::is_operator());
     cls.def("__contains__",
             (bool (Box::*)(LonLat const &) const) & Box::contains,
             py::is_operator());
     cls.def("__contains__", (bool (Box::*)(Box const &) const) & Box::contains,
             py::is_operator());
-    // Rewrap this base class method since there are overloads in this subclass
-    cls.def("__contains__",
-            (bool (Box::*)(UnitVector3d const &) const) & Box::contains,
-            py::is_operator());
 
     cls.def("getLon", &Box::getLon);
     cls.def("getLat", &Box::getLat);
@@ -93,15 +95,16 @@ void defineClass(py::class_<Box, std::unique_ptr<Box>, Region> &cls) {
     cls.def("getCenter", &Box::getCenter);
     cls.def("getWidth", &Box::getWidth);
     cls.def("getHeight", &Box::getHeight);
-    cls.def("contains", (bool (Box::*)(LonLat const &) const) & Box::contains);
-    cls.def("contains", (bool (Box::*)(Box const &) const) & Box::contains);
     // Rewrap these base class methods since there are overloads in this subclass
     cls.def("contains",
             (bool (Box::*)(UnitVector3d const &) const) & Box::contains);
+    cls.def("contains", (bool (Box::*)(LonLat const &) const) & Box::contains);
+    cls.def("contains", (bool (Box::*)(Box const &) const) & Box::contains);
     cls.def("contains", py::vectorize((bool (Box::*)(double, double, double) const)&Box::contains),
             "x"_a, "y"_a, "z"_a);
     cls.def("contains", py::vectorize((bool (Box::*)(double, double) const)&Box::contains),
             "lon"_a, "lat"_a);
+    cls.def("contains", &python::containsArray, "xyz"_a);
     cls.def("isDisjointFrom",
             (bool (Box::*)(LonLat const &) const) & Box::isDisjointFrom);
     cls.def("isDisjointFrom",
@@ -140,7 +143,7 @@ void defineClass(py::class_<Box, std::unique_ptr<Box>, Region> &cls) {
     // Rewrap this base class method since there are overloads in this subclass
     cls.def("relate",
             (Relationship(Box::*)(Region const &) const) & Box::relate,
-            "region"_a);
+            "region"_a, py::call_guard<py::gil_scoped_release>());
 
     // Note that the Region interface has already been wrapped.
 
@@ -60,28 +60,31 @@ void defineClass(py::class_<Circle, std::unique_ptr<Circle>, Region> &cls) {
 
     cls.def("__eq__", &Circle::operator==, py::is_operator());
     cls.def("__ne__", &Circle::operator!=, py::is_operator());
-    cls.def("__contains__",
-            (bool (Circle::*)(Circle const &) const) & Circle::contains,
-            py::is_operator());
+    // Point overloads come first; they are the most frequently called, and
+    // rejecting an argument of the wrong class is expensive in pybind11.
     // Rewrap this base class method since there are overloads in this subclass
     cls.def("__contains__",
             (bool (Circle::*)(UnitVector3d const &) const) & Circle::contains,
             py::is_operator());
+    cls.def("__contains__",
+            (bool (Circle::*)(Circle const &) const) & Circle::contains,
+            py::is_operator());
 
     cls.def("isEmpty", &Circle::isEmpty);
     cls.def("isFull", &Circle::isFull);
     cls.def("getCenter", &Circle::getCenter);
     cls.def("getSquaredChordLength", &Circle::getSquaredChordLength);
     cls.def("getOpeningAngle", &Circle::getOpeningAngle);
-    cls.def("contains",
-            (bool (Circle::*)(Circle const &) const) & Circle::contains);
     // Rewrap these base class methods since there are overloads in this subclass
     cls.def("contains",
             (bool (Circle::*)(UnitVector3d const &) const) & Circle::contains);
+    cls.def("contains",
+            (bool (Circle::*)(Circle const &) const) & Circle::contains);
     cls.def("contains", py::vectorize((bool (Circle::*)(double, double, double) const)&Circle::contains),
             "x"_a, "y"_a, "z"_a);
     cls.def("contains", py::vectorize((bool (Circle::*)(double, double) const)&Circle::contains),
             "lon"_a, "lat"_a);
+    cls.def("contains", &python::containsArray, "xyz"_a);
 
     cls.def("isDisjointFrom",
             (bool (Circle::*)(UnitVector3d const &) const) &
@@ -35,19 +35,40 @@ namespace sphgeom {
 namespace {
 
 py::str _repr(const char *format, CompoundRegion const &self) {
-    py::object first = py::cast(self.getOperand(0), py::return_value_policy::reference);
-    py::object second = py::cast(self.getOperand(1), py::return_value_policy::reference);
-    return py::str(format).format(first, second);
+    py::list operands;
+    for (std::size_t i = 0; i < self.nOperands(); ++i) {
+        operands.append(py::repr(py::cast(self.getOperand(i), py::return_value_policy::reference)));
+    }
+    return py::str(format).format(py::str(", ").attr("join")(operands));
+}
+
+template <typename R>
+std::unique_ptr<R> _construct(py::args args) {
+    return std::make_unique<R>(python::convert_region_sequence(args));
 }
 
 }  // namespace
 
 template <>
 void defineClass(py::class_<CompoundRegion, std::unique_ptr<CompoundRegion>, Region> &cls) {
+    cls.def("nOperands", &CompoundRegion::nOperands);
+    // Indexing returns a copy of a single operand, like cloneOperand, since
+    // compound regions are immutable. Iteration falls back to __getitem__,
+    // so it copies the operands one at a time rather than building a list.
+    cls.def("__len__", &CompoundRegion::nOperands);
+    // Like every other region, a compound region is true, even with no
+    // operands (an intersection of nothing is the full sphere).
+    cls.def("__bool__", [](CompoundRegion const &) { return true; });
+    cls.def(
+        "__getitem__",
+        [](CompoundRegion const &self, py::int_ n) {
+            return self.getOperand(python::convertIndex(self.nOperands(), n)).clone();
+        }
+    );
     cls.def(
         "cloneOperand",
         [](CompoundRegion const &self, std::ptrdiff_t n) {
-            return self.getOperand(python::convertIndex(2, n)).clone();
+            return self.getOperand(python::convertIndex(self.nOperands(), n)).clone();
         }
     );
 }
@@ -55,17 +76,17 @@ void defineClass(py::class_<CompoundRegion, std::unique_ptr<CompoundRegion>, Reg
 template <>
 void defineClass(py::class_<UnionRegion, std::unique_ptr<UnionRegion>, CompoundRegion> &cls) {
     cls.attr("TYPE_CODE") = py::int_(UnionRegion::TYPE_CODE);
-    cls.def(py::init<Region const &, Region const &>());
+    cls.def(py::init(&_construct<UnionRegion>));
     cls.def(py::pickle(&python::encode, &python::decode<UnionRegion>));
-    cls.def("__repr__", [](CompoundRegion const &self) { return _repr("UnionRegion({!r}, {!r})", self); });
+    cls.def("__repr__", [](CompoundRegion const &self) { return _repr("UnionRegion({})", self); });
 }
 
 template <>
 void defineClass(py::class_<IntersectionRegion, std::unique_ptr<IntersectionRegion>, CompoundRegion> &cls) {
     cls.attr("TYPE_CODE") = py::int_(IntersectionRegion::TYPE_CODE);
-    cls.def(py::init<Region const &, Region const &>());
+    cls.def(py::init(&_construct<IntersectionRegion>));
     cls.def(py::pickle(&python::encode, &python::decode<IntersectionRegion>));
-    cls.def("__repr__", [](CompoundRegion const &self) { return _repr("IntersectionRegion({!r}, {!r})", self); });
+    cls.def("__repr__", [](CompoundRegion const &self) { return _repr("IntersectionRegion({})", self); });
 }
 
 }  // namespace sphgeom
@@ -0,0 +1,58 @@
+/*
+ * LSST Data Management System
+ * See COPYRIGHT file at the top of the source tree.
+ *
+ * This product includes software developed by the
+ * LSST Project (http://www.lsst.org/).
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the LSST License Statement and
+ * the GNU General Public License along with this program.  If not,
+ * see <https://www.lsstcorp.org/LegalNotices/>.
+ */
+
+#ifndef LSST_SPHGEOM_PCH_H_
+#define LSST_SPHGEOM_PCH_H_
+
+/// \file
+/// \brief Headers precompiled by setup.py and force-included into every
+///        translation unit of the Python extension.
+///
+/// The pybind11 headers dominate the parse time of the binding sources, so
+/// they are compiled once up front rather than once per source file. This
+/// header must not be included directly.
+
+#include "pybind11/pybind11.h"
+#include "pybind11/numpy.h"
+#include "pybind11/stl.h"
+
+#include "lsst/sphgeom/python.h"
+#include "lsst/sphgeom/python/utils.h"
+
+#include "lsst/sphgeom/Angle.h"
+#include "lsst/sphgeom/AngleInterval.h"
+#include "lsst/sphgeom/Box.h"
+#include "lsst/sphgeom/Box3d.h"
+#include "lsst/sphgeom/Circle.h"
+#include "lsst/sphgeom/CompoundRegion.h"
+#include "lsst/sphgeom/ConvexPolygon.h"
+#include "lsst/sphgeom/Ellipse.h"
+#include "lsst/sphgeom/LonLat.h"
+#include "lsst/sphgeom/Matrix3d.h"
+#include "lsst/sphgeom/NormalizedAngle.h"
+#include "lsst/sphgeom/NormalizedAngleInterval.h"
+#include "lsst/sphgeom/RangeSet.h"
+#include "lsst/sphgeom/Region.h"
+#include "lsst/sphgeom/UnitVector3d.h"
+#include "lsst/sphgeom/Vector3d.h"
+
+#endif  // LSST_SPHGEOM_PCH_H_
@@ -53,13 +53,16 @@ void defineClass(py::class_<Region, std::unique_ptr<Region>> &cls) {
             "x"_a, "y"_a, "z"_a);
     cls.def("contains", py::vectorize((bool (Region::*)(double, double) const)&Region::contains),
             "lon"_a, "lat"_a);
+    cls.def("contains", &python::containsArray, "xyz"_a);
     cls.def("__contains__", py::overload_cast<UnitVector3d const &>(&Region::contains, py::const_),
             py::is_operator());
     // The per-subclass relate() overloads are used to implement
-    // double-dispatch in C++, and are not needed in Python.
+    // double-dispatch in C++, and are not needed in Python. Relating two
+    // regions (compound regions in particular) can be costly and touches no
+    // Python objects, so other threads may run in the meantime.
     cls.def("relate",
             (Relationship(Region::*)(Region const &) const) & Region::relate,
-            "region"_a);
+            "region"_a, py::call_guard<py::gil_scoped_release>());
     cls.def("encode", &python::encode);
     cls.def_static("decode", &python::decode<Region>, "bytes"_a);
 }
@@ -20,6 +20,9 @@
  * see <https://www.lsstcorp.org/LegalNotices/>.
  */
 #include "pybind11/pybind11.h"
+#include "pybind11/numpy.h"
+
+#include <algorithm>
 
 #include "lsst/sphgeom/python.h"
 
@@ -35,6 +38,41 @@ using namespace pybind11::literals;
 namespace lsst {
 namespace sphgeom {
 
+namespace {
+
+using DoubleArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+/// Convert arrays of longitudes and latitudes in radians, which must have
+/// the same shape, to an array of unit vector components with an additional
+/// last axis of length 3. Each vector is computed exactly as
+/// UnitVector3d(LonLat) would compute it.
+DoubleArray fromLonLatArray(DoubleArray lon, DoubleArray lat) {
+    if (lon.ndim() != lat.ndim() ||
+        !std::equal(lon.shape(), lon.shape() + lon.ndim(), lat.shape())) {
+        throw py::value_error("lon and lat must have the same shape");
+    }
+    std::vector<py::ssize_t> shape(lon.shape(), lon.shape() + lon.ndim());
+    shape.push_back(3);
+    DoubleArray result(shape);
+    double const *lonData = lon.data();
+    double const *latData = lat.data();
+    double *out = result.mutable_data();
+    py::ssize_t n = lon.size();
+    {
+        // The loop does not touch any Python objects.
+        py::gil_scoped_release release;
+        for (py::ssize_t i = 0; i < n; ++i, out += 3) {
+            UnitVector3d v(LonLat::fromRadians(lonData[i], latData[i]));
+            out[0] = v.x();
+            out[1] = v.y();
+            out[2] = v.z();
+        }
+    }
+    return result;
+}
+
+}  // <anonymous>
+
 template <>
 void defineClass(py::class_<UnitVector3d, std::shared_ptr<UnitVector3d>> &cls) {
     // Provide the equivalent of the UnitVector3d to Vector3d C++ cast
@@ -57,15 +95,19 @@ void defineClass(py::class_<UnitVector3d, std::shared_ptr<UnitVector3d>> &cls) {
     cls.def_static("X", &UnitVector3d::X);
     cls.def_static("Y", &UnitVector3d::Y);
     cls.def_static("Z", &UnitVector3d::Z);
+    cls.def_static("fromLonLatArray", &fromLonLatArray, "lon"_a, "lat"_a);
     // The fromNormalized static factory functions are not exposed to
     // Python, as they are easy to misuse and intended only for performance
     // critical code (i.e. not Python).
 
+    // pybind11 tries overloads in order, and rejecting an argument of the
+    // wrong class is much more expensive than accepting one of the right
+    // class, so the most common single argument constructors come first.
     cls.def(py::init<>());
-    cls.def(py::init<UnitVector3d const &>(), "unitVector"_a);
+    cls.def(py::init<LonLat const &>(), "lonLat"_a);
     cls.def(py::init<Vector3d const &>(), "vector"_a);
+    cls.def(py::init<UnitVector3d const &>(), "unitVector"_a);
     cls.def(py::init<double, double, double>(), "x"_a, "y"_a, "z"_a);
-    cls.def(py::init<LonLat const &>(), "lonLat"_a);
     cls.def(py::init<Angle, Angle>(), "lon"_a, "lat"_a);
 
     cls.def("__eq__", &UnitVector3d::operator==, py::is_operator());
@@ -58,6 +58,12 @@ if yaml:
     if CLoader is not None:
         YamlLoaders += (CLoader,)
 
+    # Representers are registered per dumper class, so register them with
+    # the safe dumpers too, allowing yaml.safe_dump to be used.
+    YamlDumpers = (yaml.Dumper, yaml.SafeDumper)
+    if hasattr(yaml, "CDumper"):
+        YamlDumpers += (yaml.CDumper, yaml.CSafeDumper)
+
 
 # Regions
 
@@ -84,7 +90,8 @@ def region_constructor(loader, node):
 # Register all the region classes with the same constructor and representer
 if yaml:
     for region_class in (ConvexPolygon, Ellipse, Circle, Box, UnionRegion, IntersectionRegion):
-        yaml.add_representer(region_class, region_representer)
+        for dumper in YamlDumpers:
+            yaml.add_representer(region_class, region_representer, Dumper=dumper)
 
         for loader in YamlLoaders:
             yaml.add_constructor(f"lsst.sphgeom.{region_class.__name__}", region_constructor, Loader=loader)
@@ -124,6 +131,7 @@ def pixel_constructor(loader, node):
 # All the pixelization schemes use the same approach with getLevel
 if yaml:
     for pixelSchemeCls in (HtmPixelization, Q3cPixelization, Mq3cPixelization, HealpixPixelization):
-        yaml.add_representer(pixelSchemeCls, pixel_representer)
+        for dumper in YamlDumpers:
+            yaml.add_representer(pixelSchemeCls, pixel_representer, Dumper=dumper)
         for loader in YamlLoaders:
             yaml.add_constructor(f"lsst.sphgeom.{pixelSchemeCls.__name__}", pixel_constructor, Loader=loader)
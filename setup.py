@@ -10,23 +10,176 @@ This is not a complete definition.
 """
 
 import glob
+import os
+import platform
+import shutil
 
 # Importing this automatically enables parallelized builds
 import numpy.distutils.ccompiler  # noqa: F401
 from setuptools import setup
-from pybind11.setup_helpers import Pybind11Extension, build_ext
+from setuptools.command.build_clib import build_clib as setuptools_build_clib
+from pybind11.setup_helpers import Pybind11Extension, build_ext as pybind11_build_ext, has_flag
 
-# Find the source code -- we can combine it into a single module
+# Headers that are precompiled once and then force-included into every
+# translation unit of the extension, see build_ext below.
+pch_header = os.path.abspath("python/lsst/sphgeom/_pch.h")
+
+
+# Release optimization flags shared by the library and the extension.  Link
+# time optimization lets the linker inline across the two, and unreferenced
+# code is dropped from the extension.  Hidden visibility matters for the
+# latter: only PyInit__sphgeom is exported, and exported symbols would keep
+# their code alive regardless of use.  Flags that change floating point
+# semantics (e.g. -ffast-math) or tie the build to the build machine (e.g.
+# -march=native) must not be added here.
+if platform.system() == "Windows":
+    opt_compile_args = ["/O2", "/GL"]
+    opt_link_args = ["/LTCG"]
+else:
+    opt_compile_args = ["-fvisibility=hidden", "-fvisibility-inlines-hidden",
+                        "-flto=auto", "-ffat-lto-objects",
+                        "-ffunction-sections", "-fdata-sections"]
+    if platform.system() == "Darwin":
+        opt_link_args = ["-Wl,-dead_strip"]
+    else:
+        opt_link_args = ["-Wl,-O1", "-Wl,--as-needed", "-Wl,--gc-sections"]
+
+
+def optimization_flags(compiler):
+    """Return the compile and link flags from ``opt_compile_args`` and
+    ``opt_link_args`` that the compiler supports.
+    """
+    if compiler.compiler_type == "msvc":
+        return opt_compile_args, opt_link_args
+    compile_args = [flag for flag in opt_compile_args if has_flag(compiler, flag)]
+    link_args = [flag for flag in compile_args if flag.startswith("-flto")] + opt_link_args
+    return compile_args, link_args
+
+
+def cxx_compiler_command(compiler):
+    """Return the command the compiler uses for C++ sources.
+
+    Newer setuptools versions use a separate ``compiler_so_cxx`` command for
+    C++, older ones compile everything with ``compiler_so``.
+    """
+    return getattr(compiler, "compiler_so_cxx", None) or compiler.compiler_so
+
+
+def use_ccache(compiler):
+    """Prefix the compiler commands with ccache, if it is available."""
+    ccache = shutil.which("ccache")
+    if not ccache or compiler.compiler_type != "unix":
+        return
+    for attr in ("compiler_so", "compiler_so_cxx"):
+        command = getattr(compiler, attr, None)
+        if command and "ccache" not in command[0]:
+            setattr(compiler, attr, [ccache] + command)
+    # Required for ccache to cache objects that use a precompiled header.
+    os.environ.setdefault("CCACHE_SLOPPINESS", "pch_defines,time_macros")
+
+
+class build_clib(setuptools_build_clib):
+    """Build the sphgeom C++ library as a static library, once, for the
+    extension to link against.
+    """
+
+    def build_libraries(self, libraries):
+        use_ccache(self.compiler)
+        # Compile the library with the flags Pybind11Extension gives the
+        # extension it is linked into, so that its symbols are hidden too
+        # and it only carries debug information if CFLAGS asks for it.
+        cflags = list(ext_cflags)
+        if self.compiler.compiler_type == "msvc":
+            cflags += ["/std:c++17"]
+        else:
+            cflags += ["-std=c++17"]
+        cflags += optimization_flags(self.compiler)[0]
+        super().build_libraries([(name, dict(info, cflags=cflags + info.get("cflags", [])))
+                                 for name, info in libraries])
+
+
+class build_ext(pybind11_build_ext):
+    """Build extensions through ccache, when it is available, and with a
+    precompiled header on compilers that support GCC-style ``.gch`` files.
+
+    The C++ libraries the extensions link against are built first, so that
+    ``build_ext --inplace`` works on its own.
+    """
+
+    def run(self):
+        if self.distribution.has_c_libraries():
+            self.run_command("build_clib")
+        super().run()
+
+    def build_extensions(self):
+        use_ccache(self.compiler)
+        super().build_extensions()
+
+    def build_extension(self, ext):
+        compile_args, link_args = optimization_flags(self.compiler)
+        ext.extra_compile_args += compile_args
+        ext.extra_link_args += link_args
+        # Relink when the C++ library has been rebuilt.
+        build_clib = self.get_finalized_command("build_clib")
+        ext.depends += [os.path.join(build_clib.build_clib, self.compiler.library_filename(name))
+                        for name in build_clib.get_library_names() or []]
+        if self.compiler.compiler_type == "unix":
+            header = self._build_pch(ext)
+            ext.extra_compile_args += ["-include", header, "-Winvalid-pch"]
+        super().build_extension(ext)
+
+    def _build_pch(self, ext):
+        # The precompiled header is built in build_temp, next to a copy of
+        # the header that the sources then include, so that builds for
+        # different Python versions or configurations do not share it.
+        #
+        # The precompiled header is only used if it was compiled with the
+        # same compiler and flags as the source file including it;
+        # -Winvalid-pch makes it visible when that is not the case, and the
+        # compiler falls back to parsing the header itself.  The command line
+        # is recorded next to the output so that a change of flags triggers a
+        # rebuild.  Returns the path of the header to include.
+        os.makedirs(self.build_temp, exist_ok=True)
+        header = os.path.abspath(os.path.join(self.build_temp, os.path.basename(pch_header)))
+        self.copy_file(pch_header, header)
+        gch = header + ".gch"
+        include_dirs = ext.include_dirs + self.compiler.include_dirs
+        command = (cxx_compiler_command(self.compiler)
+                   + ["-I" + os.path.abspath(d) for d in include_dirs]
+                   + ext.extra_compile_args
+                   + ["-x", "c++-header", header, "-o", gch])
+        stamp = gch + ".cmd"
+        if (os.path.exists(gch) and os.path.getmtime(gch) >= os.path.getmtime(header)
+                and os.path.exists(stamp)):
+            with open(stamp) as f:
+                if f.read() == " ".join(command):
+                    return header
+        self.compiler.spawn(command)
+        with open(stamp, "w") as f:
+            f.write(" ".join(command))
+        return header
+
+
+# Find the source code.  The main sphgeom library code is compiled once into
+# a static library, and only the bindings are compiled into the extension.
 pybind_src = sorted(glob.glob("python/lsst/sphgeom/*.cc"))
 cpp_src = sorted(glob.glob("src/*.cc"))
+cpp_headers = sorted(glob.glob("include/lsst/sphgeom/*.h") + glob.glob("src/*.h"))
+
+# The library is named so that it can not be confused with the shared
+# libsphgeom built by SCons or CMake, which may be on the library path.
+libraries = [("sphgeom_core", {"sources": cpp_src,
+                               "include_dirs": ["include"],
+                               "obj_deps": {"": cpp_headers}})]
 
-# Very inefficient approach since this compiles the maing sphgeom
-# library code for every extension rather than building everything once
 ext_modules = [Pybind11Extension("lsst.sphgeom._sphgeom",
-                                 sorted(cpp_src + pybind_src),
-                                 include_dirs=["include"])]
+                                 pybind_src,
+                                 include_dirs=["include"],
+                                 depends=[pch_header])]
+ext_cflags = list(ext_modules[0].extra_compile_args)
 
 setup(
+    libraries=libraries,
     ext_modules=ext_modules,
-    cmdclass={'build_ext': build_ext},
+    cmdclass={'build_clib': build_clib, 'build_ext': build_ext},
 )
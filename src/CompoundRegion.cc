@@ -25,8 +25,10 @@
 
 #include "lsst/sphgeom/CompoundRegion.h"
 
+#include <algorithm>
 #include <iostream>
 #include <stdexcept>
+#include <utility>
 
 #include "lsst/sphgeom/Box.h"
 #include "lsst/sphgeom/Box3d.h"
@@ -51,50 +53,135 @@ std::uint64_t consumeDecodeU64(std::uint8_t const *&buffer, std::uint8_t const *
     return result;
 }
 
-template <typename F>
-auto getUnionBounds(UnionRegion const &compound, F func) {
-    auto bounds = func(compound.getOperand(0));
-    bounds.expandTo(func(compound.getOperand(1)));
+template <typename Bounds, typename F>
+Bounds getUnionBounds(UnionRegion const &compound, F func) {
+    Bounds bounds = Bounds::empty();
+    for (std::size_t i = 0; i < compound.nOperands(); ++i) {
+        bounds.expandTo(func(compound.getOperand(i)));
+    }
     return bounds;
 }
 
-template <typename F>
-auto getIntersectionBounds(IntersectionRegion const &compound, F func) {
-    auto bounds = func(compound.getOperand(0));
-    bounds.clipTo(func(compound.getOperand(1)));
+// The bounds of an intersection are clipped down from `bounds`, which must
+// bound the full sphere.
+template <typename Bounds, typename F>
+Bounds getIntersectionBounds(IntersectionRegion const &compound, F func, Bounds bounds) {
+    for (std::size_t i = 0; i < compound.nOperands(); ++i) {
+        bounds.clipTo(func(compound.getOperand(i)));
+    }
     return bounds;
 }
 
+std::vector<std::unique_ptr<Region>> cloneOperands(Region const &first, Region const &second) {
+    std::vector<std::unique_ptr<Region>> operands;
+    operands.reserve(2);
+    operands.push_back(first.clone());
+    operands.push_back(second.clone());
+    return operands;
+}
+
+// Return a rough rank for the cost of testing whether a unit vector is
+// inside a region. Circles need a single dot product, ellipses a matrix
+// product, polygons a cross and dot product per edge, and boxes a conversion
+// to spherical coordinates. Compound regions can be arbitrarily costly.
+int getContainsCost(Region const &r) {
+    if (dynamic_cast<Circle const *>(&r)) {
+        return 0;
+    } else if (dynamic_cast<Ellipse const *>(&r)) {
+        return 1;
+    } else if (dynamic_cast<ConvexPolygon const *>(&r)) {
+        return 2;
+    } else if (dynamic_cast<Box const *>(&r)) {
+        return 3;
+    }
+    return 4;
+}
+
+std::vector<Region const *> getContainsOrder(std::vector<std::unique_ptr<Region>> const &operands) {
+    std::vector<std::pair<int, Region const *>> ranked;
+    ranked.reserve(operands.size());
+    for (auto const &operand : operands) {
+        ranked.emplace_back(getContainsCost(*operand), operand.get());
+    }
+    std::stable_sort(ranked.begin(), ranked.end(),
+                     [](auto const &a, auto const &b) { return a.first < b.first; });
+    std::vector<Region const *> result;
+    result.reserve(ranked.size());
+    for (auto const &r : ranked) {
+        result.push_back(r.second);
+    }
+    return result;
+}
+
 }  // namespace
 
 CompoundRegion::CompoundRegion(Region const &first, Region const &second)
-        : _operands{first.clone(), second.clone()} {}
+        : _operands(cloneOperands(first, second)),
+          _containsOrder(getContainsOrder(_operands)) {}
 
-CompoundRegion::CompoundRegion(
-    std::array<std::unique_ptr<Region>, 2> operands) noexcept
-        : _operands(std::move(operands)) {}
+CompoundRegion::CompoundRegion(std::vector<std::unique_ptr<Region>> operands)
+        : _operands(std::move(operands)),
+          _containsOrder(getContainsOrder(_operands)) {}
+
+CompoundRegion::CompoundRegion(CompoundRegion const &other) {
+    _operands.reserve(other.nOperands());
+    for (auto const &operand : other._operands) {
+        _operands.push_back(operand->clone());
+    }
+    _containsOrder = getContainsOrder(_operands);
+}
 
-CompoundRegion::CompoundRegion(CompoundRegion const &other)
-        : _operands{other.getOperand(0).clone(), other.getOperand(1).clone()} {}
+CompoundRegion::CompoundRegion(CompoundRegion &&other) noexcept
+        : _operands(std::move(other._operands)),
+          _containsOrder(std::move(other._containsOrder)) {}
 
 Relationship CompoundRegion::relate(Box const &b) const { return relate(static_cast<Region const &>(b)); }
 Relationship CompoundRegion::relate(Circle const &c) const { return relate(static_cast<Region const &>(c)); }
 Relationship CompoundRegion::relate(ConvexPolygon const &p) const { return relate(static_cast<Region const &>(p)); }
 Relationship CompoundRegion::relate(Ellipse const &e) const { return relate(static_cast<Region const &>(e)); }
 
+template <typename R>
+std::vector<std::unique_ptr<Region>> CompoundRegion::_flatten(
+    std::vector<std::unique_ptr<Region>> operands) {
+    std::vector<std::unique_ptr<Region>> result;
+    result.reserve(operands.size());
+    for (auto &operand : operands) {
+        // Compound operands of type R are themselves already flat.
+        if (auto *compound = dynamic_cast<R *>(operand.get())) {
+            for (auto &nested : compound->_operands) {
+                result.push_back(std::move(nested));
+            }
+        } else {
+            result.push_back(std::move(operand));
+        }
+    }
+    return result;
+}
+
 std::vector<std::uint8_t> CompoundRegion::_encode(std::uint8_t tc) const {
-    std::vector<std::uint8_t> buffer;
-    buffer.push_back(tc);
-    auto buffer1 = getOperand(0).encode();
-    encodeU64(buffer1.size(), buffer);
-    buffer.insert(buffer.end(), buffer1.begin(), buffer1.end());
-    auto buffer2 = getOperand(1).encode();
-    encodeU64(buffer2.size(), buffer);
-    buffer.insert(buffer.end(), buffer2.begin(), buffer2.end());
-    return buffer;
-}
-
-std::array<std::unique_ptr<Region>, 2> CompoundRegion::_decode(
+    std::call_once(_encodedOnce, [this, tc]() {
+        // Encode the operands first, so that the output buffer can be
+        // allocated once rather than grown operand by operand.
+        std::vector<std::vector<std::uint8_t>> operandBuffers;
+        operandBuffers.reserve(_operands.size());
+        std::size_t size = 1;
+        for (auto const &operand : _operands) {
+            operandBuffers.push_back(operand->encode());
+            size += 8 + operandBuffers.back().size();
+        }
+        std::vector<std::uint8_t> buffer;
+        buffer.reserve(size);
+        buffer.push_back(tc);
+        for (auto const &operandBuffer : operandBuffers) {
+            encodeU64(operandBuffer.size(), buffer);
+            buffer.insert(buffer.end(), operandBuffer.begin(), operandBuffer.end());
+        }
+        _encoded = std::move(buffer);
+    });
+    return _encoded;
+}
+
+std::vector<std::unique_ptr<Region>> CompoundRegion::_decode(
     std::uint8_t tc, std::uint8_t const *buffer, std::size_t nBytes) {
     std::uint8_t const *end = buffer + nBytes;
     if (nBytes == 0) {
@@ -104,15 +191,14 @@ std::array<std::unique_ptr<Region>, 2> CompoundRegion::_decode(
         throw std::runtime_error("Byte string is not an encoded CompoundRegion.");
     }
     ++buffer;
-    std::array<std::unique_ptr<Region>, 2> result;
-    std::uint64_t nBytes1 = consumeDecodeU64(buffer, end);
-    result[0] = Region::decode(buffer, nBytes1);
-    buffer += nBytes1;
-    std::uint64_t nBytes2 = consumeDecodeU64(buffer, end);
-    result[1] = Region::decode(buffer, nBytes2);
-    buffer += nBytes2;
-    if (buffer != end) {
-        throw std::runtime_error("Encoded CompoundRegion is has unexpected additional bytes.");
+    std::vector<std::unique_ptr<Region>> result;
+    while (buffer != end) {
+        std::uint64_t nBytesOperand = consumeDecodeU64(buffer, end);
+        if (nBytesOperand > static_cast<std::uint64_t>(end - buffer)) {
+            throw std::runtime_error("Encoded CompoundRegion is truncated.");
+        }
+        result.push_back(Region::decode(buffer, nBytesOperand));
+        buffer += nBytesOperand;
     }
     return result;
 }
@@ -131,65 +217,114 @@ std::unique_ptr<CompoundRegion> CompoundRegion::decode(uint8_t const *buffer, si
     }
 }
 
+UnionRegion::UnionRegion(Region const &first, Region const &second)
+        : CompoundRegion(_flatten<UnionRegion>(cloneOperands(first, second))) {}
+
+UnionRegion::UnionRegion(std::vector<std::unique_ptr<Region>> operands)
+        : CompoundRegion(_flatten<UnionRegion>(std::move(operands))) {}
+
 Box UnionRegion::getBoundingBox() const {
-    return getUnionBounds(*this, [](Region const &r) { return r.getBoundingBox(); });
+    return getUnionBounds<Box>(*this, [](Region const &r) { return r.getBoundingBox(); });
 }
 
 Box3d UnionRegion::getBoundingBox3d() const {
-    return getUnionBounds(*this, [](Region const &r) { return r.getBoundingBox3d(); });
+    return getUnionBounds<Box3d>(*this, [](Region const &r) { return r.getBoundingBox3d(); });
 }
 
 Circle UnionRegion::getBoundingCircle() const {
-    return getUnionBounds(*this, [](Region const &r) { return r.getBoundingCircle(); });
+    return getUnionBounds<Circle>(*this, [](Region const &r) { return r.getBoundingCircle(); });
 }
 
 bool UnionRegion::contains(UnitVector3d const &v) const {
-    return getOperand(0).contains(v) || getOperand(1).contains(v);
+    for (Region const *operand : _getContainsOrder()) {
+        if (operand->contains(v)) {
+            return true;
+        }
+    }
+    return false;
 }
 
 Relationship UnionRegion::relate(Region const &rhs) const {
-    auto r1 = getOperand(0).relate(rhs);
-    auto r2 = getOperand(1).relate(rhs);
+    // Bits set in the relationships of all operands, and of any operand.
+    Relationship all = DISJOINT | WITHIN;
+    Relationship any = INTERSECTS;
+    for (std::size_t i = 0; i < nOperands(); ++i) {
+        auto r = getOperand(i).relate(rhs);
+        all &= r;
+        any |= r;
+        // Once an operand contains the given region and neither DISJOINT
+        // nor WITHIN can still hold, the remaining operands cannot change
+        // the result.
+        if ((any & CONTAINS).any() && (all & (DISJOINT | WITHIN)).none()) {
+            break;
+        }
+    }
     return
-        // Both operands must be disjoint with the given region for the union
+        // All operands must be disjoint with the given region for the union
         // to be disjoint with it.
-        ((r1 & DISJOINT) & (r2 & DISJOINT))
-        // Both operands must be within the given region for the union to be
+        (all & DISJOINT)
+        // All operands must be within the given region for the union to be
         // within it.
-        | ((r1 & WITHIN) & (r2 & WITHIN))
-        // If either operand contains the given region, the union contains it.
-        | ((r1 & CONTAINS) | (r2 & CONTAINS));
+        | (all & WITHIN)
+        // If any operand contains the given region, the union contains it.
+        | (any & CONTAINS);
 }
 
+IntersectionRegion::IntersectionRegion(Region const &first, Region const &second)
+        : CompoundRegion(_flatten<IntersectionRegion>(cloneOperands(first, second))) {}
+
+IntersectionRegion::IntersectionRegion(std::vector<std::unique_ptr<Region>> operands)
+        : CompoundRegion(_flatten<IntersectionRegion>(std::move(operands))) {}
+
 Box IntersectionRegion::getBoundingBox() const {
-    return getIntersectionBounds(*this, [](Region const &r) { return r.getBoundingBox(); });
+    return getIntersectionBounds(*this, [](Region const &r) { return r.getBoundingBox(); }, Box::full());
 }
 
 Box3d IntersectionRegion::getBoundingBox3d() const {
-    return getIntersectionBounds(*this, [](Region const &r) { return r.getBoundingBox3d(); });
+    return getIntersectionBounds(*this, [](Region const &r) { return r.getBoundingBox3d(); },
+                                 Box3d::aroundUnitSphere());
 }
 
 Circle IntersectionRegion::getBoundingCircle() const {
-    return getIntersectionBounds(*this, [](Region const &r) { return r.getBoundingCircle(); });
+    return getIntersectionBounds(*this, [](Region const &r) { return r.getBoundingCircle(); }, Circle::full());
 }
 
 bool IntersectionRegion::contains(UnitVector3d const &v) const {
-    return getOperand(0).contains(v) && getOperand(1).contains(v);
+    for (Region const *operand : _getContainsOrder()) {
+        if (!operand->contains(v)) {
+            return false;
+        }
+    }
+    return true;
 }
 
 Relationship IntersectionRegion::relate(Region const &rhs) const {
-    auto r1 = getOperand(0).relate(rhs);
-    auto r2 = getOperand(1).relate(rhs);
+    // Bits set in the relationships of all operands, and of any operand.
+    Relationship all = CONTAINS;
+    Relationship any = INTERSECTS;
+    for (std::size_t i = 0; i < nOperands(); ++i) {
+        auto r = getOperand(i).relate(rhs);
+        all &= r;
+        any |= r;
+        // Once CONTAINS can no longer hold and both DISJOINT and WITHIN
+        // do, the remaining operands cannot change the result. This rarely
+        // happens early: a region disjoint from the intersection but not
+        // containing it (the common case for disjoint queries) never sets
+        // WITHIN, so every operand is still related.
+        if ((all & CONTAINS).none() && (any & (DISJOINT | WITHIN)) == (DISJOINT | WITHIN)) {
+            break;
+        }
+    }
     return
-        // Both operands must contain the given region for the intersection to
+        // All operands must contain the given region for the intersection to
         // contain it.
-        ((r1 & CONTAINS) & (r2 & CONTAINS))
-        // If either operand is disjoint with the given region, the
+        (all & CONTAINS)
+        // If any operand is disjoint with the given region, the
         // intersection is disjoint with it.
-        | ((r1 & DISJOINT) | (r2 & DISJOINT))
-        // If either operand is within the given region, the intersection is
+        | (any & DISJOINT)
+        // If any operand is within the given region, the intersection is
         // within it.
-        | ((r1 & WITHIN) | (r2 & WITHIN));
+        | (any & WITHIN);
 }
 
 }  // namespace sphgeom
@@ -93,6 +93,7 @@ class CircleTestCase(unittest.TestCase):
         lon = np.arctan2(y, x)
         lat = np.arctan2(z, np.hypot(x, y))
         c2 = b.contains(lon, lat)
+        self.assertTrue(np.array_equal(b.contains(np.stack([x, y, z], axis=-1)), c))
         for i in range(x.shape[0]):
             for j in range(x.shape[1]):
                 u = UnitVector3d(x[i, j], y[i, j], z[i, j])
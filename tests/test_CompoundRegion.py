@@ -22,6 +22,9 @@
 
 import pickle
 import unittest
+from collections import Counter
+
+import numpy as np
 
 try:
     import yaml
@@ -46,6 +49,18 @@ from lsst.sphgeom import (
     UnitVector3d,
 )
 
+# Names that may appear in the repr of the compound regions under test.
+_EVAL_NS = dict(
+    UnionRegion=UnionRegion,
+    IntersectionRegion=IntersectionRegion,
+    Box=Box,
+    Circle=Circle,
+    UnitVector3d=UnitVector3d,
+    Angle=Angle,
+    AngleInterval=AngleInterval,
+    NormalizedAngleInterval=NormalizedAngleInterval,
+)
+
 
 class CompoundRegionTestMixin:
     """Tests for both UnionRegion and IntersectionRegion.
@@ -55,28 +70,40 @@ class CompoundRegionTestMixin:
     being tested.
     """
 
-    def setUp(self):
-        self.point_in_circle = LonLat.fromDegrees(44.0, 45.0)
-        self.point_in_box = LonLat.fromDegrees(46.0, 45.0)
-        self.point_in_both = LonLat.fromDegrees(45.0, 45.0)
-        self.point_in_neither = LonLat.fromDegrees(45.0, 48.0)
-        self.circle = Circle(UnitVector3d(self.point_in_circle), Angle.fromDegrees(1.0))
-        self.box = Box.fromDegrees(
-            self.point_in_box.getLon().asDegrees() - 1.5,
-            self.point_in_box.getLat().asDegrees() - 1.5,
-            self.point_in_box.getLon().asDegrees() + 1.5,
-            self.point_in_box.getLat().asDegrees() + 1.5,
-        )
-        self.faraway = Circle(
-            UnitVector3d(self.point_in_neither), Angle.fromDegrees(0.1)
+    @classmethod
+    def setUpClass(cls):
+        # These are not modified by the tests, so they are shared by all
+        # of them; only ``instance`` is created anew for each test.
+        super().setUpClass()
+        cls.point_in_circle = LonLat.fromDegrees(44.0, 45.0)
+        cls.point_in_box = LonLat.fromDegrees(46.0, 45.0)
+        cls.point_in_both = LonLat.fromDegrees(45.0, 45.0)
+        cls.point_in_neither = LonLat.fromDegrees(45.0, 48.0)
+        cls.uv_in_circle = UnitVector3d(cls.point_in_circle)
+        cls.uv_in_box = UnitVector3d(cls.point_in_box)
+        cls.uv_in_both = UnitVector3d(cls.point_in_both)
+        cls.uv_in_neither = UnitVector3d(cls.point_in_neither)
+        cls.circle = Circle(cls.uv_in_circle, Angle.fromDegrees(1.0))
+        cls.box = Box.fromDegrees(
+            cls.point_in_box.getLon().asDegrees() - 1.5,
+            cls.point_in_box.getLat().asDegrees() - 1.5,
+            cls.point_in_box.getLon().asDegrees() + 1.5,
+            cls.point_in_box.getLat().asDegrees() + 1.5,
         )
-        self.operands = (self.circle, self.box)
+        cls.faraway = Circle(cls.uv_in_neither, Angle.fromDegrees(0.1))
+        cls.operands = (cls.circle, cls.box)
 
     def assertOperandsEqual(self, region, operands):
         """Assert that a compound regions operands are equal to the given
         tuple of operands.
         """
-        self.assertCountEqual((region.cloneOperand(0), region.cloneOperand(1)), operands)
+        self.assertEqual(region.nOperands(), len(operands))
+        # Regions are not hashable, so compare multisets of their encodings
+        # rather than pairwise.
+        self.assertEqual(
+            Counter((type(r).__name__, r.encode()) for r in map(region.cloneOperand, range(len(operands)))),
+            Counter((type(r).__name__, r.encode()) for r in operands),
+        )
 
     def assertCompoundRegionsEqual(self, a, b):
         """Assert that two compound regions are equal.
@@ -87,20 +114,20 @@ class CompoundRegionTestMixin:
         these tests do implement equality comparison.
         """
         self.assertEqual(type(a), type(b))
-        self.assertOperandsEqual(a, (b.cloneOperand(0), b.cloneOperand(1)))
+        self.assertOperandsEqual(a, [b.cloneOperand(i) for i in range(b.nOperands())])
 
     def testSetUp(self):
         """Test that the points and operand regions being tested have the
         relationships expected.
         """
-        self.assertTrue(self.circle.contains(UnitVector3d(self.point_in_circle)))
-        self.assertTrue(self.circle.contains(UnitVector3d(self.point_in_both)))
-        self.assertFalse(self.circle.contains(UnitVector3d(self.point_in_box)))
-        self.assertFalse(self.circle.contains(UnitVector3d(self.point_in_neither)))
-        self.assertTrue(self.box.contains(UnitVector3d(self.point_in_box)))
-        self.assertTrue(self.box.contains(UnitVector3d(self.point_in_both)))
-        self.assertFalse(self.box.contains(UnitVector3d(self.point_in_circle)))
-        self.assertFalse(self.box.contains(UnitVector3d(self.point_in_neither)))
+        self.assertTrue(self.circle.contains(self.uv_in_circle))
+        self.assertTrue(self.circle.contains(self.uv_in_both))
+        self.assertFalse(self.circle.contains(self.uv_in_box))
+        self.assertFalse(self.circle.contains(self.uv_in_neither))
+        self.assertTrue(self.box.contains(self.uv_in_box))
+        self.assertTrue(self.box.contains(self.uv_in_both))
+        self.assertFalse(self.box.contains(self.uv_in_circle))
+        self.assertFalse(self.box.contains(self.uv_in_neither))
         self.assertEqual(self.circle.relate(self.circle), CONTAINS | WITHIN)
         self.assertEqual(self.circle.relate(self.box), INTERSECTS)
         self.assertEqual(self.circle.relate(self.faraway), DISJOINT)
@@ -108,13 +135,74 @@ class CompoundRegionTestMixin:
         self.assertEqual(self.box.relate(self.box), CONTAINS | WITHIN)
         self.assertEqual(self.box.relate(self.faraway), DISJOINT)
 
+    def testContainsArray(self):
+        """Test vectorized point-in-region checks on an array of unit
+        vectors.
+        """
+        points = (self.uv_in_circle, self.uv_in_box, self.uv_in_both, self.uv_in_neither)
+        xyz = np.array([[p.x(), p.y(), p.z()] for p in points])
+        expected = [self.instance.contains(p) for p in points]
+        self.assertEqual(self.instance.contains(xyz).tolist(), expected)
+        self.assertEqual(self.instance.contains(xyz.reshape(2, 2, 3)).tolist(),
+                         [expected[:2], expected[2:]])
+        # Non-contiguous and non-normalized input.
+        self.assertEqual(self.instance.contains(2.0*xyz[::2]).tolist(), expected[::2])
+        with self.assertRaises(ValueError):
+            self.instance.contains(xyz[:, :2])
+
+    def testContainsOrder(self):
+        """Test that point-in-region checks do not depend on the order of
+        the operands.
+        """
+        cls = type(self.instance)
+        other = IntersectionRegion if cls is UnionRegion else UnionRegion
+        reordered = cls(other(self.box, self.box), self.circle)
+        for p in (self.uv_in_circle, self.uv_in_box, self.uv_in_both, self.uv_in_neither):
+            self.assertEqual(cls(*reversed(self.operands)).contains(p), self.instance.contains(p))
+            self.assertEqual(reordered.contains(p), cls(self.box, self.circle).contains(p))
+
     def testOperands(self):
         """Test the cloneOperands accessor."""
         self.assertOperandsEqual(self.instance, self.operands)
 
+    def testSequence(self):
+        """Test len, indexing and iteration over the operands."""
+        self.assertEqual(len(self.instance), len(self.operands))
+        # Regions are true regardless of how many operands they have.
+        self.assertTrue(self.instance)
+        self.assertTrue(UnionRegion())
+        self.assertTrue(IntersectionRegion())
+        self.assertCountEqual(list(self.instance), self.operands)
+        self.assertEqual(self.instance[-1], self.instance[len(self.operands) - 1])
+        for i, operand in enumerate(self.instance):
+            self.assertEqual(type(operand), type(self.instance.cloneOperand(i)))
+            self.assertEqual(operand, self.instance.cloneOperand(i))
+        with self.assertRaises(IndexError):
+            self.instance[len(self.operands)]
+        # Operands are copies; modifying them does not modify the region.
+        self.instance[0].dilateBy(Angle.fromDegrees(1.0))
+        self.assertOperandsEqual(self.instance, self.operands)
+
+    def testNested(self):
+        """Test that nesting compound regions of the same type flattens
+        their operands, while nesting other compound regions does not.
+        """
+        cls = type(self.instance)
+        nested = cls(self.instance, cls(self.faraway, self.instance))
+        self.assertOperandsEqual(nested, self.operands + (self.faraway,) + self.operands)
+        other = IntersectionRegion if cls is UnionRegion else UnionRegion
+        nested = cls(other(*self.operands), self.faraway)
+        self.assertEqual(nested.nOperands(), 2)
+        self.assertEqual(type(nested.cloneOperand(0)), other)
+        with self.assertRaises(TypeError):
+            cls(self.circle, 1)
+
     def testCodec(self):
         """Test that encode and decode round-trip."""
         s = self.instance.encode()
+        # Repeated and copied encodings are the same.
+        self.assertEqual(self.instance.encode(), s)
+        self.assertEqual(self.instance.clone().encode(), s)
         self.assertCompoundRegionsEqual(type(self.instance).decode(s), self.instance)
         self.assertCompoundRegionsEqual(CompoundRegion.decode(s), self.instance)
         self.assertCompoundRegionsEqual(Region.decode(s), self.instance)
@@ -123,6 +211,10 @@ class CompoundRegionTestMixin:
         """Test pickling round-trips."""
         s = pickle.dumps(self.instance, pickle.HIGHEST_PROTOCOL)
         self.assertCompoundRegionsEqual(pickle.loads(s), self.instance)
+        # The pickled state is the encoded byte string, not one pickle per
+        # operand.
+        self.assertIn(self.instance.encode(), s)
+        self.assertNotIn(b"Circle", s)
 
     def testString(self):
         """Test that repr returns a string that can be eval'd to yield an
@@ -130,38 +222,36 @@ class CompoundRegionTestMixin:
         """
         self.assertCompoundRegionsEqual(
             self.instance,
-            eval(
-                repr(self.instance),
-                dict(
-                    UnionRegion=UnionRegion,
-                    IntersectionRegion=IntersectionRegion,
-                    Box=Box,
-                    Circle=Circle,
-                    UnitVector3d=UnitVector3d,
-                    Angle=Angle,
-                    AngleInterval=AngleInterval,
-                    NormalizedAngleInterval=NormalizedAngleInterval,
-                ),
-            ),
+            eval(repr(self.instance), _EVAL_NS),
         )
 
     @unittest.skipIf(not yaml, "YAML module can not be imported")
     def testYaml(self):
         """Test that YAML dump and load round-trip."""
         self.assertCompoundRegionsEqual(yaml.safe_load(yaml.dump(self.instance)), self.instance)
+        self.assertCompoundRegionsEqual(yaml.safe_load(yaml.safe_dump(self.instance)), self.instance)
 
 
 class UnionRegionTestCase(CompoundRegionTestMixin, unittest.TestCase):
     def setUp(self):
-        CompoundRegionTestMixin.setUp(self)
         self.instance = UnionRegion(*self.operands)
 
     def testContains(self):
         """Test point-in-region checks."""
-        self.assertTrue(self.instance.contains(UnitVector3d(self.point_in_both)))
-        self.assertTrue(self.instance.contains(UnitVector3d(self.point_in_circle)))
-        self.assertTrue(self.instance.contains(UnitVector3d(self.point_in_box)))
-        self.assertFalse(self.instance.contains(UnitVector3d(self.point_in_neither)))
+        self.assertTrue(self.instance.contains(self.uv_in_both))
+        self.assertTrue(self.instance.contains(self.uv_in_circle))
+        self.assertTrue(self.instance.contains(self.uv_in_box))
+        self.assertFalse(self.instance.contains(self.uv_in_neither))
+
+    def testEmpty(self):
+        """Test a union with no operands, which is empty."""
+        empty = UnionRegion()
+        self.assertEqual(empty.nOperands(), 0)
+        self.assertFalse(empty.contains(self.uv_in_both))
+        self.assertTrue(empty.getBoundingBox().isEmpty())
+        self.assertTrue(empty.getBoundingCircle().isEmpty())
+        self.assertEqual(empty.relate(self.circle), DISJOINT | WITHIN)
+        self.assertCompoundRegionsEqual(UnionRegion.decode(empty.encode()), empty)
 
     def testRelate(self):
         """Test region-region relationship checks."""
@@ -171,19 +261,33 @@ class UnionRegionTestCase(CompoundRegionTestMixin, unittest.TestCase):
         self.assertEqual(self.circle.relate(self.instance), WITHIN)
         self.assertEqual(self.box.relate(self.instance), WITHIN)
         self.assertEqual(self.faraway.relate(self.instance), DISJOINT)
+        # relate folds over more than two operands.
+        self.assertEqual(UnionRegion(self.circle, self.box, self.faraway).relate(self.circle), CONTAINS)
 
 
 class IntersectionRegionTestCase(CompoundRegionTestMixin, unittest.TestCase):
     def setUp(self):
-        CompoundRegionTestMixin.setUp(self)
         self.instance = IntersectionRegion(*self.operands)
 
     def testContains(self):
         """Test point-in-region checks."""
-        self.assertTrue(self.instance.contains(UnitVector3d(self.point_in_both)))
-        self.assertFalse(self.instance.contains(UnitVector3d(self.point_in_circle)))
-        self.assertFalse(self.instance.contains(UnitVector3d(self.point_in_box)))
-        self.assertFalse(self.instance.contains(UnitVector3d(self.point_in_neither)))
+        self.assertTrue(self.instance.contains(self.uv_in_both))
+        self.assertFalse(self.instance.contains(self.uv_in_circle))
+        self.assertFalse(self.instance.contains(self.uv_in_box))
+        self.assertFalse(self.instance.contains(self.uv_in_neither))
+
+    def testEmpty(self):
+        """Test an intersection with no operands, which is the full
+        sphere.
+        """
+        full = IntersectionRegion()
+        self.assertEqual(full.nOperands(), 0)
+        self.assertTrue(full.contains(self.uv_in_neither))
+        self.assertTrue(full.getBoundingBox().isFull())
+        self.assertEqual(full.getBoundingBox3d(), Circle.full().getBoundingBox3d())
+        self.assertTrue(full.getBoundingCircle().isFull())
+        self.assertEqual(full.relate(self.circle), CONTAINS)
+        self.assertCompoundRegionsEqual(IntersectionRegion.decode(full.encode()), full)
 
     def testRelate(self):
         """Test region-region relationship checks."""
@@ -193,6 +297,9 @@ class IntersectionRegionTestCase(CompoundRegionTestMixin, unittest.TestCase):
         self.assertEqual(self.circle.relate(self.instance), CONTAINS)
         self.assertEqual(self.box.relate(self.instance), CONTAINS)
         self.assertEqual(self.faraway.relate(self.instance), DISJOINT)
+        # relate folds over more than two operands.
+        self.assertEqual(IntersectionRegion(self.faraway, self.circle, self.box).relate(self.circle),
+                         DISJOINT | WITHIN)
 
 
 if __name__ == "__main__":
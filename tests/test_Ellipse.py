@@ -89,6 +89,7 @@ class EllipseTestCase(unittest.TestCase):
         lon = np.arctan2(y, x)
         lat = np.arctan2(z, np.hypot(x, y))
         c2 = e.contains(lon, lat)
+        self.assertTrue(np.array_equal(e.contains(np.stack([x, y, z], axis=-1)), c))
         for i in range(x.shape[0]):
             for j in range(x.shape[1]):
                 u = UnitVector3d(x[i, j], y[i, j], z[i, j])
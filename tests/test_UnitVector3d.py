@@ -25,6 +25,8 @@ import pickle
 import math
 import unittest
 
+import numpy as np
+
 from lsst.sphgeom import Angle, LonLat, UnitVector3d, Vector3d
 
 
@@ -50,6 +52,21 @@ class UnitVector3dTestCase(unittest.TestCase):
         self.assertAlmostEqual(c.y(), d.y(), places=15)
         self.assertAlmostEqual(c.z(), d.z(), places=15)
 
+    def testFromLonLatArray(self):
+        lon = np.linspace(-math.pi, 3*math.pi, 12).reshape(3, 4)
+        lat = np.linspace(-0.5*math.pi, 0.5*math.pi, 12).reshape(3, 4)
+        xyz = UnitVector3d.fromLonLatArray(lon, lat)
+        self.assertEqual(xyz.shape, (3, 4, 3))
+        for i in range(lon.shape[0]):
+            for j in range(lon.shape[1]):
+                u = UnitVector3d(LonLat.fromRadians(lon[i, j], lat[i, j]))
+                self.assertEqual(tuple(xyz[i, j]), (u.x(), u.y(), u.z()))
+        # test with non-contiguous memory
+        self.assertTrue(np.array_equal(UnitVector3d.fromLonLatArray(lon[:, ::2], lat[:, ::2]),
+                                       xyz[:, ::2]))
+        with self.assertRaises(ValueError):
+            UnitVector3d.fromLonLatArray(lon, lat[:2])
+
     def testComparison(self):
         self.assertEqual(UnitVector3d.X(), UnitVector3d.X())
         self.assertNotEqual(UnitVector3d.Y(), UnitVector3d.Z())